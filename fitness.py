@@ -1,28 +1,68 @@
+import atexit
+import bisect
+import io
+import json
 import os
 import csv
+import queue
+import sys
+import threading
+import time
 from datetime import datetime
-import platform  # For detecting the operating system
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # pyarrow is optional; fall back to the stdlib csv writer
+    pa = None
+
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_BMI_BOUNDS = [18.5, 25.0, 30.0]
+_BMI_LABELS = ["Underweight", "Normal weight", "Overweight", "Obesity"]
+
+_CSV_HEADERS = ['Date', 'Height (cm)', 'Weight (kg)', 'BMI', 'BMI Category', 'Trained Body Part', 'Exercise', 'Weight (kg)', 'Reps', 'Sets']
+
+_SHUTDOWN = object()  # Sentinel telling the writer thread to stop
+
+def _ts():
+    """Returns the current timestamp without allocating a datetime object."""
+    return time.strftime(_TIMESTAMP_FORMAT, time.localtime())
+
+def _csv_escape(value):
+    """Quotes a CSV field only if it actually needs quoting."""
+    text = str(value)
+    if '"' in text or ',' in text or '\n' in text or '\r' in text:
+        return '"' + text.replace('"', '""') + '"'
+    return text
 
 def calculate_bmi(weight, height_cm):
     """Calculate BMI given weight in kg and height in cm and categorize it."""
     height_m = height_cm / 100.0
     bmi = weight / (height_m ** 2)
-    if bmi < 18.5:
-        category = "Underweight"
-    elif 18.5 <= bmi <= 24.9:
-        category = "Normal weight"
-    elif 25 <= bmi <= 29.9:
-        category = "Overweight"
-    else:
-        category = "Obesity"
+    category = _BMI_LABELS[bisect.bisect(_BMI_BOUNDS, bmi)]
     return bmi, category
 
 class FitnessApp:
     def __init__(self):
+        # Block-buffer stdout so multi-line menus go out in one write; input()
+        # flushes the stream before reading, so prompts still appear on time.
+        try:
+            sys.stdout.reconfigure(line_buffering=False, write_through=False)
+        except (AttributeError, ValueError):
+            pass  # Not a regular text stream (e.g. replaced in tests)
+        # When stdin is piped (scripted replay), slurp it in one read and serve
+        # prompts from memory instead of paying a readline syscall per input().
+        self._script = None if sys.stdin.isatty() else iter(sys.stdin.read().splitlines())
         self.documents_path = self.get_documents_path()
         self.folder_path = self.ensure_folder_exists()
+        self._open_output_file()
         print("\033[95m--- Welcome to the Fitness Tracker App! ---\033[0m")
         self.user_info = self.input_user_info()  # Collect and display BMI info at startup
+        # The user's stats are fixed for the session, so build the row prefix once,
+        # along with its pre-escaped CSV form for the direct formatting path.
+        self._user_prefix = (self.user_info['height_cm'], self.user_info['weight_kg'], self.user_info['BMI'], self.user_info['BMI Category'])
+        self._user_prefix_csv = ",".join(map(_csv_escape, self._user_prefix))
         self.body_parts = ["Chest", "Back", "Arms", "Shoulders", "Legs"]
         self.exercises = {
             "Chest": [
@@ -53,6 +93,41 @@ class FitnessApp:
                 "Standing Calf Raise", "Seated Calf Raise", "RDL's"
             ]
         }
+        # Flatten the exercise lists into one contiguous tuple with (start, end)
+        # offsets per body part; menu slices and lookups index into the tuple.
+        self._ex_flat = tuple(ex for part in self.body_parts for ex in self.exercises[part])
+        self._ex_ranges = {}
+        start = 0
+        for part in self.body_parts:
+            end = start + len(self.exercises[part])
+            self._ex_ranges[part] = (start, end)
+            start = end
+        # Valid menu selections are fixed too, so compile them into frozensets
+        # once and validate with a single membership test per choice.
+        self._valid_part_indices = frozenset(range(1, len(self.body_parts) + 1))
+        self._valid_ex_tokens = {
+            part: frozenset(str(i) for i in range(1, len(exs) + 1))
+            for part, exs in self.exercises.items()
+        }
+        # Every part and exercise name comes from these fixed menus, so escape
+        # each one for CSV a single time here instead of per saved row.
+        self._csv_safe = {name: _csv_escape(name) for name in (*self.body_parts, *self._ex_flat)}
+        # Menus never change during a session, so render each one to a string once.
+        self._menu_body_parts = "\n".join(f"\033[93m{i}. {part}\033[0m" for i, part in enumerate(self.body_parts, start=1))
+        self._menu_exercises = {
+            part: "\n".join(f"\033[94m{idx}. {ex}\033[0m" for idx, ex in enumerate(exs, start=1))
+            for part, exs in self.exercises.items()
+        }
+
+    def _input(self, prompt):
+        """Like input(), but serves pre-read lines when stdin is not a terminal."""
+        if self._script is None:
+            return input(prompt)
+        print(prompt, end='')
+        try:
+            return next(self._script)
+        except StopIteration:
+            raise EOFError("scripted input exhausted") from None
 
     @staticmethod
     def get_documents_path():
@@ -62,49 +137,140 @@ class FitnessApp:
     def ensure_folder_exists(self):
         """Ensures the 'Gym Progress' folder exists, creates it if it does not."""
         folder_path = os.path.join(self.documents_path, 'Gym Progress')
-        if not os.path.exists(folder_path):
+        try:
             os.makedirs(folder_path)
             print("\033[92mSuccessfully created directory:\033[0m", folder_path)
+        except FileExistsError:
+            pass
         return folder_path
 
+    def _load_profile(self):
+        """Returns the saved height/weight profile, or None if absent or unreadable."""
+        try:
+            with open(os.path.join(self.folder_path, 'profile.json')) as fh:
+                profile = json.load(fh)
+            return float(profile['height_cm']), float(profile['weight_kg'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_profile(self, height_cm, weight_kg):
+        """Persists height/weight so the next session can skip re-entering them."""
+        try:
+            with open(os.path.join(self.folder_path, 'profile.json'), 'w') as fh:
+                json.dump({'height_cm': height_cm, 'weight_kg': weight_kg}, fh)
+        except OSError:
+            pass  # The profile cache is best-effort; the session continues without it
+
     def input_user_info(self):
-        """Prompt the user for height and weight, calculate BMI, and categorize it."""
+        """Prompt the user for height and weight, calculate BMI, and categorize it.
+
+        If a previous session saved a profile, offer to reuse it instead of
+        re-prompting for both values.
+        """
+        profile = self._load_profile()
+        if profile is not None:
+            height_cm, weight_kg = profile
+            bmi, category = calculate_bmi(weight_kg, height_cm)
+            print(f"\033[96mSaved profile: {height_cm:g} cm, {weight_kg:g} kg — BMI {bmi:.2f} ({category})\033[0m")
+            if self.prompt_yes_no("Use the saved height and weight?"):
+                return {"height_cm": height_cm, "weight_kg": weight_kg, "BMI": bmi, "BMI Category": category}
         while True:
             try:
-                height_cm = float(input("\nEnter your height in cm: "))
-                weight_kg = float(input("Enter your weight in kg: "))
+                height_cm = float(self._input("\nEnter your height in cm: "))
+                weight_kg = float(self._input("Enter your weight in kg: "))
                 if height_cm > 0 and weight_kg > 0:
                     bmi, category = calculate_bmi(weight_kg, height_cm)
                     print(f"\033[96mYour BMI is: {bmi:.2f} ({category})\033[0m")  # BMI formatted to two decimal places
+                    self._save_profile(height_cm, weight_kg)
                     return {"height_cm": height_cm, "weight_kg": weight_kg, "BMI": bmi, "BMI Category": category}
                 else:
                     print("\033[91mPlease enter positive values for height and weight.\033[0m")
             except ValueError:
                 print("\033[91mInvalid input. Please enter valid numbers.\033[0m")
                 
-    def save_fitness_data(self, data):
-        """Saves the fitness data to a file named with today's date in the 'Gym Progress' folder."""
+    def _open_output_file(self):
+        """Opens today's data file once for the session and keeps it open for reuse."""
         today = datetime.now().strftime("%Y-%m-%d")
-        file_extension = 'csv' if platform.system() != 'Windows' else 'xls'
-        filename = f"{today}.{file_extension}"
-        file_path = os.path.join(self.folder_path, filename)
+        self._csv_path = os.path.join(self.folder_path, f"{today}.csv")
 
-        headers = ['Date', 'Height (cm)', 'Weight (kg)', 'BMI', 'BMI Category', 'Trained Body Part', 'Exercise', 'Weight (kg)', 'Reps', 'Sets']
-        file_exists = os.path.isfile(file_path)
+        file_exists = os.path.exists(self._csv_path)
+        self._csv_fh = open(self._csv_path, 'ab', buffering=1 << 20)
+        if not file_exists:
+            self._csv_fh.write(self._format_rows([_CSV_HEADERS]))
+        self._write_queue = queue.Queue()
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+        atexit.register(self._close_output_file)
 
-        with open(file_path, 'a', newline='') as file:
-            writer = csv.writer(file)
-            if not file_exists:
-                writer.writerow(headers)
-            for entry in data:
-                writer.writerow([entry[0], self.user_info['height_cm'], self.user_info['weight_kg'], self.user_info['BMI'], self.user_info['BMI Category']] + entry[1:])
+    def _writer_loop(self):
+        """Drains queued batches and writes them, keeping disk I/O off the input thread."""
+        while True:
+            batch = self._write_queue.get()
+            if batch is _SHUTDOWN:
+                break
+            self._write_batch(batch)
+
+    def _close_output_file(self):
+        """Drains the writer, syncs buffered rows to disk once, and closes the file."""
+        self._write_queue.put(_SHUTDOWN)
+        self._writer_thread.join()
+        if not self._csv_fh.closed:
+            self._csv_fh.flush()
+            os.fsync(self._csv_fh.fileno())
+            self._csv_fh.close()
 
-        print("\033[92mData successfully saved to:\033[0m", file_path)
+    @staticmethod
+    def _format_rows(rows):
+        """Formats rows to CSV bytes so a batch can be written in one call."""
+        buf = io.StringIO()
+        csv.writer(buf).writerows(rows)
+        return buf.getvalue().encode('utf-8')
+
+    def save_fitness_data(self, data):
+        """Queues a column-wise batch for the background writer and returns at once."""
+        self._write_queue.put(data)
+        print("\033[92mData successfully saved to:\033[0m", self._csv_path)
+
+    def _write_batch(self, data):
+        """Writes one queued batch to the session file (runs on the writer thread)."""
+        count = len(data['ts'])
+        if pa is not None:
+            # The columns are already contiguous lists, so pyarrow can format them in C.
+            arrays = [pa.array(data['ts']),
+                      *(pa.array([value] * count) for value in self._user_prefix),
+                      pa.array(data['part']), pa.array(data['exercise']),
+                      pa.array(data['weight']), pa.array(data['reps']), pa.array(data['sets'])]
+            table = pa.Table.from_arrays(arrays, names=_CSV_HEADERS)
+            pa_csv.write_csv(table, self._csv_fh, write_options=pa_csv.WriteOptions(include_header=False))
+        else:
+            # All fields are pre-escaped or numeric, so skip csv.writer's
+            # per-field quoting scan and join each row directly.
+            prefix = self._user_prefix_csv
+            safe = self._csv_safe
+            lines = [f"{ts},{prefix},{safe[part]},{safe[exercise]},{weight},{reps},{sets}\r\n"
+                     for ts, part, exercise, weight, reps, sets in
+                     zip(data['ts'], data['part'], data['exercise'], data['weight'], data['reps'], data['sets'])]
+            self._csv_fh.write("".join(lines).encode('utf-8'))
+        self._csv_fh.flush()
+
+    @staticmethod
+    def _parse_triple(line):
+        """Parses a 'weight,reps,sets' line into (float, int, int), or None if invalid."""
+        try:
+            weight_s, reps_s, sets_s = line.split(',')
+            weight = float(weight_s)
+            reps = int(reps_s)
+            sets = int(sets_s)
+        except ValueError:
+            return None
+        if weight > 0 and reps > 0 and sets > 0:
+            return weight, reps, sets
+        return None
 
     def prompt_yes_no(self, message):
         """Prompts a yes/no question and returns True for 'yes' or 'y', False for 'no' or 'n'."""
         while True:
-            response = input(message + " (\033[94myes/y\033[0m or \033[91mno/n\033[0m): ").lower()
+            response = self._input(message + " (\033[94myes/y\033[0m or \033[91mno/n\033[0m): ").lower()
             if response in ['yes', 'y']:
                 return True
             elif response in ['no', 'n']:
@@ -115,34 +281,36 @@ class FitnessApp:
     def input_body_parts_and_exercises(self):
         """Allows the user to select multiple body parts they trained and the specific exercises."""
         print("\n\033[95m--- Select Body Parts You Trained ---\033[0m")
-        for i, part in enumerate(self.body_parts, start=1):
-            print(f"\033[93m{i}. {part}\033[0m")
-        parts_choice = input("Enter the numbers of the body parts you trained, separated by commas: ")
-        selected_parts = sorted(set(parts_choice.split(',')), key=int)  # Sort numerically and remove duplicates
+        print(self._menu_body_parts)
+        parts_choice = self._input("Enter the numbers of the body parts you trained, separated by commas: ")
+        # Parse each token a single time; the set removes duplicates and sorted orders numerically.
+        selected_parts = sorted({int(t.strip()) for t in parts_choice.split(',') if t.strip().isdigit()})
 
-        exercises_data = []
+        exercises_data = {'ts': [], 'part': [], 'exercise': [], 'weight': [], 'reps': [], 'sets': []}
         for part_index in selected_parts:
-            if part_index.isdigit() and 1 <= int(part_index) <= len(self.body_parts):
-                part = self.body_parts[int(part_index) - 1]
+            if part_index in self._valid_part_indices:
+                part = self.body_parts[part_index - 1]
+                ex_start = self._ex_ranges[part][0]
+                valid_ex_tokens = self._valid_ex_tokens[part]
                 while True:
                     print(f"\n\033[96m--- Select Exercises for {part} ---\033[0m")
-                    for idx, ex in enumerate(self.exercises[part], start=1):
-                        print(f"\033[94m{idx}. {ex}\033[0m")
-                    ex_choice = input("Enter the number of the exercise you performed: ")
-                    if ex_choice.isdigit() and 1 <= int(ex_choice) <= len(self.exercises[part]):
-                        exercise = self.exercises[part][int(ex_choice) - 1]
+                    print(self._menu_exercises[part])
+                    ex_choice = self._input("Enter the number of the exercise you performed: ")
+                    if ex_choice in valid_ex_tokens:
+                        exercise = self._ex_flat[ex_start + int(ex_choice) - 1]
                         while True:
-                            try:
-                                weight = float(input("Enter the weight used (in kg): "))
-                                reps = int(input("Enter the number of reps: "))
-                                sets = int(input("Enter the number of sets: "))
-                                if weight > 0 and reps > 0 and sets > 0:
-                                    break
-                                else:
-                                    print("\033[91mPlease enter positive numbers for weight, reps, and sets.\033[0m")
-                            except ValueError:
-                                print("\033[91mInvalid input. Please enter valid numbers.\033[0m")
-                        exercises_data.append([datetime.now().strftime("%Y-%m-%d %H:%M:%S"), part, exercise, weight, reps, sets])
+                            line = self._input("Enter weight (kg), reps, sets (e.g. 60,10,3): ")
+                            parsed = self._parse_triple(line)
+                            if parsed is not None:
+                                weight, reps, sets = parsed
+                                break
+                            print("\033[91mInvalid input. Please enter positive numbers as weight,reps,sets.\033[0m")
+                        exercises_data['ts'].append(_ts())
+                        exercises_data['part'].append(part)
+                        exercises_data['exercise'].append(exercise)
+                        exercises_data['weight'].append(weight)
+                        exercises_data['reps'].append(reps)
+                        exercises_data['sets'].append(sets)
                         
                         more = self.prompt_yes_no("Add another exercise for the same body part?")
                         if not more:
@@ -154,7 +322,7 @@ class FitnessApp:
     def main_loop(self):
         while True:
             data = self.input_body_parts_and_exercises()
-            if data:
+            if data['ts']:
                 self.save_fitness_data(data)
                 another = self.prompt_yes_no("Would you like to enter exercises for another set of body parts?")
                 if not another: